@@ -1,13 +1,16 @@
 import click
+import json as jsonlib
+import os
 import sys
 from pathlib import Path
 from typing import Optional
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 
+# NotesIndexer/NotesSearchEngine are imported inside the command functions:
+# they transitively pull in torch, transformers, and chromadb, which would
+# add seconds of startup to commands like --version, info, and clear
 from .config import settings
-from .indexer import NotesIndexer
-from .search import NotesSearchEngine
 
 console = Console()
 
@@ -41,6 +44,7 @@ def main(command, query, path, force, top_k, verbose, files_only, json, yes, ver
         psearch index                      # Index notes directory
         psearch index --path ~/notes       # Index specific directory
         psearch interactive                # Interactive search mode
+        psearch serve                      # Run warm search daemon
         psearch info                       # Show configuration
         psearch clear                      # Clear the index
         psearch --version                  # Show version
@@ -69,7 +73,7 @@ def main(command, query, path, force, top_k, verbose, files_only, json, yes, ver
         return
     
     # If command looks like a search query (no recognized command)
-    if command and command not in ['index', 'search', 'interactive', 'info', 'clear']:
+    if command and command not in ['index', 'search', 'interactive', 'serve', 'info', 'clear']:
         # Treat the command as part of the search query
         full_query = ' '.join([command] + list(query))
         do_search(full_query, top_k, verbose, files_only, json)
@@ -88,7 +92,10 @@ def main(command, query, path, force, top_k, verbose, files_only, json, yes, ver
     
     elif command == 'interactive':
         do_interactive()
-    
+
+    elif command == 'serve':
+        do_serve()
+
     elif command == 'info':
         do_info()
     
@@ -107,13 +114,21 @@ def do_search(query_str: str, top_k: Optional[int] = None, verbose: bool = False
     if not query_str.strip():
         console.print("[red]Please provide a search query[/red]")
         return
-    
-    search_engine = NotesSearchEngine()
-    
+
+    # A running daemon already holds the loaded models; use it when available
+    from .daemon import request_search, display_payload
+    payload = request_search(query_str, top_k=top_k, verbose=verbose)
+    if payload is not None:
+        display_payload(payload, verbose=verbose, files_only=files_only, json_output=json_output)
+        return
+
+    from .search import get_search_engine
+    search_engine = get_search_engine()
+
     if not search_engine.vectorstore:
         console.print("[red]No index found. Please run 'psearch index' first.[/red]")
         return
-    
+
     results = search_engine.search(query_str, top_k=top_k)
     search_engine.display_results(results, query_str, verbose=verbose, files_only=files_only, json_output=json_output)
 
@@ -134,6 +149,7 @@ def do_index(path: Optional[Path] = None, force: bool = False):
         else:
             return
     
+    from .indexer import NotesIndexer
     indexer = NotesIndexer(notes_dir=notes_dir)
     num_chunks = indexer.index(force_reindex=force)
     
@@ -146,12 +162,13 @@ def do_interactive():
     console.print("[bold]Personal Search Engine - Interactive Mode[/bold]")
     console.print("Type 'quit' or 'exit' to leave\n")
     
-    search_engine = NotesSearchEngine()
-    
+    from .search import get_search_engine
+    search_engine = get_search_engine()
+
     if not search_engine.vectorstore:
         console.print("[red]No index found. Please run 'psearch index' first.[/red]")
         return
-    
+
     while True:
         try:
             query = Prompt.ask("\n[bold blue]Search[/bold blue]")
@@ -173,6 +190,34 @@ def do_interactive():
             console.print(f"[red]Error: {e}[/red]")
 
 
+def do_serve():
+    """Run the warm search daemon"""
+    from .daemon import serve
+    serve()
+
+
+def _count_files(root: Path) -> int:
+    """Count files under root with a scandir walk (no per-entry Path objects)"""
+    total = 0
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += 1
+                except OSError:
+                    continue
+    return total
+
+
 def do_info():
     """Show configuration information"""
     console.print("[bold]Personal Search Engine - Configuration[/bold]\n")
@@ -193,10 +238,24 @@ def do_info():
     
     console.print(table)
     
-    if settings.notes_directory.exists():
-        file_count = sum(1 for _ in settings.notes_directory.rglob('*') if _.is_file())
+    # Prefer the stats cached in the index manifest over walking the tree
+    stats = {}
+    manifest_path = settings.index_directory / "manifest.json"
+    if manifest_path.is_file():
+        try:
+            stats = jsonlib.loads(manifest_path.read_text()).get('stats', {})
+        except (OSError, jsonlib.JSONDecodeError):
+            pass
+
+    if stats:
+        console.print(
+            f"\n[dim]Indexed files: {stats.get('file_count', '?')} "
+            f"({stats.get('chunk_count', '?')} chunks, as of {stats.get('indexed_at', 'unknown')})[/dim]"
+        )
+    elif settings.notes_directory.exists():
+        file_count = _count_files(settings.notes_directory)
         console.print(f"\n[dim]Files in notes directory: {file_count}[/dim]")
-    
+
     if settings.index_directory.exists():
         console.print(f"[dim]Index exists: ✓[/dim]")
     else:
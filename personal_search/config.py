@@ -48,5 +48,40 @@ class Settings(BaseSettings):
         description="Use local embeddings instead of OpenAI"
     )
 
+    embedding_device: str = Field(
+        default="auto",
+        description="Device for local embeddings: 'auto', 'cuda', 'mps', or 'cpu'"
+    )
+
+    embedding_backend: str = Field(
+        default="huggingface",
+        description="Local embedding backend: 'huggingface' or 'onnx-int8'"
+    )
+
+    use_fast_splitter: bool = Field(
+        default=False,
+        description="Use the specialized FastSplitter instead of RecursiveCharacterTextSplitter"
+    )
+
+    syntax_highlight_limit: int = Field(
+        default=10000,
+        description="Skip syntax highlighting for result content longer than this many chars"
+    )
+
+    llm_confidence_margin: float = Field(
+        default=0.15,
+        description="Vector-score gap at the top_k cutoff beyond which LLM re-ranking is skipped"
+    )
+
+    cache_ttl_seconds: int = Field(
+        default=3600,
+        description="How long cached query results stay valid"
+    )
+
+    query_cache_size: int = Field(
+        default=128,
+        description="Max entries in the in-memory query/result caches"
+    )
+
 
 settings = Settings()
\ No newline at end of file
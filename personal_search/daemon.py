@@ -0,0 +1,189 @@
+"""Warm-process daemon so repeated searches skip model load.
+
+Every fresh `psearch` invocation pays for loading the embedding model and
+opening Chroma before any query runs. `psearch serve` keeps one process
+alive holding the loaded NotesSearchEngine and answers queries over a Unix
+domain socket; `psearch search` transparently uses the daemon when its
+socket exists and falls back to in-process search otherwise.
+
+Protocol: one JSON request line ``{"query": ..., "top_k": ..., "filter":
+..., "verbose": ...}`` per connection, answered with one JSON
+result-payload line (the same shape as the --json output).
+
+This module stays import-light: the heavy search stack is only imported
+inside serve(), so the client path adds nothing to CLI startup.
+"""
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from rich.console import Console, Group
+from rich.markup import escape as _rich_escape
+from rich.panel import Panel
+from rich.text import Text
+
+console = Console()
+
+SOCKET_PATH = Path.home() / ".personal_search" / "psearch.sock"
+
+_RECV_CHUNK = 1 << 16
+
+# orjson (Rust) serializes large result payloads several times faster than
+# stdlib json; fall back transparently when it is not installed
+try:
+    import orjson
+
+    def dumps_indent(payload: Dict[str, Any]) -> str:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def dumps_indent(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, indent=2, ensure_ascii=False)
+
+
+def _send_json(conn: socket.socket, payload: Dict[str, Any]):
+    conn.sendall(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n')
+
+
+def _recv_json(conn: socket.socket) -> Dict[str, Any]:
+    buf = b''
+    while not buf.endswith(b'\n'):
+        chunk = conn.recv(_RECV_CHUNK)
+        if not chunk:
+            break
+        buf += chunk
+    return json.loads(buf)
+
+
+def serve():
+    """Run the search daemon: load the engine once, answer queries forever"""
+    from .search import get_search_engine
+
+    engine = get_search_engine()
+    if not engine.vectorstore:
+        console.print("[red]No index found. Please run 'psearch index' first.[/red]")
+        return
+
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if SOCKET_PATH.exists():
+        SOCKET_PATH.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(str(SOCKET_PATH))
+        os.chmod(SOCKET_PATH, 0o600)  # only the owning user may query
+        server.listen(8)
+        console.print(f"[bold green]psearch daemon listening on {SOCKET_PATH}[/bold green]")
+        console.print("Press Ctrl+C to stop\n")
+
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    request = _recv_json(conn)
+                    query = request.get('query', '')
+                    results = engine.search(
+                        query,
+                        top_k=request.get('top_k'),
+                        filter_dict=request.get('filter'),
+                    )
+                    payload = engine.results_payload(
+                        results, query, verbose=request.get('verbose', False)
+                    )
+                    _send_json(conn, payload)
+                except Exception as e:
+                    try:
+                        _send_json(conn, {'error': str(e)})
+                    except OSError:
+                        pass
+
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Daemon stopped[/yellow]")
+    finally:
+        server.close()
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+
+
+def request_search(
+    query: str,
+    top_k: Optional[int] = None,
+    filter_dict: Optional[Dict[str, Any]] = None,
+    verbose: bool = False,
+    timeout: float = 60.0,
+) -> Optional[Dict[str, Any]]:
+    """Ask a running daemon for results; returns None when no daemon answers"""
+    if not SOCKET_PATH.exists():
+        return None
+
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(timeout)
+        with client:
+            client.connect(str(SOCKET_PATH))
+            _send_json(client, {
+                'query': query,
+                'top_k': top_k,
+                'filter': filter_dict,
+                'verbose': verbose,
+            })
+            payload = _recv_json(client)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if 'error' in payload:
+        console.print(f"[yellow]Daemon error: {payload['error']}[/yellow]")
+        return None
+    return payload
+
+
+def display_payload(
+    payload: Dict[str, Any],
+    verbose: bool = False,
+    files_only: bool = False,
+    json_output: bool = False,
+):
+    """Render a daemon result payload in the same styles as in-process search"""
+    query = payload.get('query', '')
+    results = payload.get('results', [])
+
+    if json_output:
+        print(dumps_indent(payload))
+        return
+
+    if not results:
+        console.print("[yellow]No results found.[/yellow]")
+        return
+
+    header = f"\n[bold blue]Found {len(results)} results for: '{query}'[/bold blue]\n"
+
+    if files_only:
+        lines = [
+            f"[bold cyan]{i:2}.[/bold cyan] {_rich_escape(result['path'])} "
+            f"[dim](Score: {result['score']:.3f})[/dim]"
+            for i, result in enumerate(results, 1)
+        ]
+        console.print(header + "\n".join(lines))
+        return
+
+    # Single write for the whole batch, matching the in-process display
+    renderables = [header]
+    for i, result in enumerate(results, 1):
+        # Escape filename and path so bracketed note names can't break
+        # Rich markup, matching the in-process render path
+        title = f"[{i}] {_rich_escape(result['filename'])} (Score: {result['score']:.3f})"
+        metadata_str = (
+            f"[dim]Path: {_rich_escape(result['path'])}\n"
+            f"Modified: {result['modified']}[/dim]"
+        )
+        renderables.append(Panel(
+            Text(result['content']),
+            title=title,
+            subtitle=metadata_str,
+            expand=False,
+            border_style="blue",
+        ))
+        renderables.append("")
+    console.print(Group(*renderables))
@@ -0,0 +1,76 @@
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+
+class ONNXEmbeddings:
+    """Sentence-transformer embeddings via ONNX Runtime with int8 quantization.
+
+    Exports the model to ONNX once, applies dynamic int8 quantization
+    (AVX512-VNNI config), and caches the result under ~/.personal_search/onnx.
+    Int8 matmuls roughly halve memory traffic and use VNNI dot products,
+    cutting CPU encode latency 2-4x versus FP32 torch.
+
+    Implements the embed_documents/embed_query interface LangChain and
+    Chroma expect, so it drops in wherever HuggingFaceEmbeddings is used.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 128):
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = self._load_quantized(model_name)
+
+    @staticmethod
+    def _load_quantized(model_name: str):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        cache_dir = Path.home() / ".personal_search" / "onnx" / model_name.replace("/", "--")
+        quantized_file = "model_quantized.onnx"
+
+        if not (cache_dir / quantized_file).is_file():
+            model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            model.save_pretrained(cache_dir)
+            quantizer = ORTQuantizer.from_pretrained(cache_dir)
+            quantizer.quantize(
+                save_dir=cache_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False),
+            )
+
+        return ORTModelForFeatureExtraction.from_pretrained(
+            cache_dir, file_name=quantized_file
+        )
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        embeddings = []
+
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            inputs = self.tokenizer(
+                batch, padding=True, truncation=True, max_length=512, return_tensors="pt"
+            )
+            outputs = self.model(**inputs)
+
+            hidden = outputs.last_hidden_state
+            if hasattr(hidden, 'numpy'):
+                hidden = hidden.numpy()
+            mask = np.asarray(inputs['attention_mask'])[:, :, None].astype(hidden.dtype)
+
+            # Mean-pool over non-padding tokens, then L2-normalize
+            summed = (hidden * mask).sum(axis=1)
+            counts = np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled = summed / counts
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            embeddings.append(pooled)
+
+        return np.concatenate(embeddings) if embeddings else np.empty((0, 0))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
@@ -1,22 +1,47 @@
 import os
+import json
+import mmap
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 import hashlib
 
+import numpy as np
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import TextLoader
 from langchain.schema import Document
-from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_openai import OpenAIEmbeddings
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from .config import settings
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 console = Console()
 
+# Directories that are never descended into during the notes walk
+_SKIP_DIRS = frozenset({'.git', '.github', '__pycache__', 'node_modules', '.venv', 'venv', 'env'})
+
+# File extensions indexed without content sniffing
+EXT_SET = frozenset({'.txt', '.md', '.py', '.js', '.json', '.yaml', '.yml', '.sh', '.sql'})
+
+# Control bytes that effectively never occur in text files
+# (0x00-0x08 and 0x0E-0x1F; tab, LF, VT, FF, and CR are allowed)
+_BINARY_BYTES = bytes(range(0, 9)) + bytes(range(14, 32))
+
 
 class NotesIndexer:
     def __init__(
@@ -32,185 +57,443 @@ class NotesIndexer:
         self.index_dir.mkdir(parents=True, exist_ok=True)
         
         if settings.use_local_embeddings:
-            self.embeddings = HuggingFaceEmbeddings(
-                model_name=self.embedding_model,
-                model_kwargs={'device': 'cpu'},
-                encode_kwargs={'normalize_embeddings': True}
-            )
+            self.embeddings = self._init_local_embeddings()
         else:
             if not settings.openai_api_key:
                 raise ValueError("OpenAI API key is required for OpenAI embeddings")
             self.embeddings = OpenAIEmbeddings(openai_api_key=settings.openai_api_key)
         
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.chunk_size,
-            chunk_overlap=settings.chunk_overlap,
-            separators=["\n\n", "\n", " ", ""],
-        )
+        if settings.use_fast_splitter:
+            from .splitter import FastSplitter
+            self.text_splitter = FastSplitter(
+                chunk_size=settings.chunk_size,
+                chunk_overlap=settings.chunk_overlap,
+            )
+        else:
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=settings.chunk_size,
+                chunk_overlap=settings.chunk_overlap,
+                separators=["\n\n", "\n", " ", ""],
+            )
         
         self.vectorstore = None
-    
+
+        # Manifest of previously indexed files (source -> mtime/hash),
+        # used to skip unchanged files on re-index
+        self.manifest_path = self.index_dir / "manifest.json"
+        self.manifest = self._load_manifest()
+        self._hash_cache = {}
+        self._docs_loaded = 0
+        self._seen_hashes = {}
+
+    def _init_local_embeddings(self):
+        if settings.embedding_backend == 'onnx-int8':
+            try:
+                from .embeddings import ONNXEmbeddings
+                return ONNXEmbeddings(self.embedding_model)
+            except ImportError:
+                console.print(
+                    "[yellow]optimum/onnxruntime not installed; "
+                    "falling back to HuggingFace embeddings[/yellow]"
+                )
+
+        device = self._resolve_device(settings.embedding_device)
+        return HuggingFaceEmbeddings(
+            model_name=self.embedding_model,
+            model_kwargs={'device': device},
+            encode_kwargs={
+                'batch_size': 256 if device != 'cpu' else 128,
+                'normalize_embeddings': True,
+            }
+        )
+
+    @staticmethod
+    def _resolve_device(device: str) -> str:
+        """Resolve the embedding device, auto-detecting CUDA/MPS when available"""
+        try:
+            import torch
+        except ImportError:
+            return 'cpu'
+
+        if device == 'auto':
+            if torch.cuda.is_available():
+                device = 'cuda'
+            elif getattr(torch.backends, 'mps', None) and torch.backends.mps.is_available():
+                device = 'mps'
+            else:
+                device = 'cpu'
+
+        if device == 'cpu':
+            torch.set_num_threads(os.cpu_count() or 1)
+        else:
+            # Let cuBLAS use TF32 kernels for the embedding matmuls
+            torch.set_float32_matmul_precision('high')
+        return device
+
+    def _load_manifest(self) -> dict:
+        if self.manifest_path.is_file():
+            try:
+                return json.loads(self.manifest_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {}
+
+    def _save_manifest(self):
+        try:
+            self.manifest_path.write_text(json.dumps(self.manifest, indent=2))
+        except OSError as e:
+            console.print(f"[yellow]Could not save index manifest: {e}[/yellow]")
+
     def _get_file_hash(self, filepath: Path) -> str:
+        # Prefer SIMD-accelerated fingerprints (blake3/xxh3) over cryptographic
+        # hashes
+        if blake3 is not None:
+            hasher = blake3.blake3()
+        elif xxhash is not None:
+            hasher = xxhash.xxh3_64()
+        else:
+            hasher = hashlib.blake2b(digest_size=16)
+
         with open(filepath, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
-    
-    def _should_skip_path(self, filepath: Path) -> bool:
-        """Check if a path should be skipped during indexing"""
-        # Directories to skip
-        skip_dirs = {'.git', '.github', '__pycache__', 'node_modules', '.venv', 'venv', 'env'}
-        
-        # Check if any parent directory should be skipped
-        for parent in filepath.parents:
-            if parent.name in skip_dirs:
-                return True
-        
-        # Check if the file itself is in a skip directory
-        if filepath.parent.name in skip_dirs:
-            return True
-            
-        # Check for .git and .github anywhere in the path
-        path_str = str(filepath)
-        if '/.git/' in path_str or '/.github/' in path_str:
-            return True
-            
-        return False
+            if os.fstat(f.fileno()).st_size == 0:
+                return hasher.hexdigest()
+            try:
+                # Feed the page cache to the hasher directly - no Python-side
+                # bytes copy of the file contents
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    madv = getattr(mmap, 'MADV_SEQUENTIAL', None)
+                    if madv is not None and hasattr(mm, 'madvise'):
+                        mm.madvise(madv)
+                    hasher.update(mm)
+            except (OSError, ValueError):
+                # mmap can fail on odd filesystems; stream in 64KB chunks
+                f.seek(0)
+                for chunk in iter(lambda: f.read(1 << 16), b''):
+                    hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _file_hash(self, filepath: Path, mtime: float) -> str:
+        """Hash a file, memoizing on (path, mtime) so a file is hashed at most once per run"""
+        key = (str(filepath), mtime)
+        cached = self._hash_cache.get(key)
+        if cached is None:
+            cached = self._hash_cache[key] = self._get_file_hash(filepath)
+        return cached
     
-    def _is_text_file(self, filepath: Path) -> bool:
+    def _is_text_file(self, filepath) -> bool:
         """Check if a file is likely to be a text file"""
+        # Read the first 1KB via a raw fd (no file-object overhead) and look
+        # for control bytes; bytes.translate runs the scan at C speed, which
+        # beats decode attempts with exception-based control flow
         try:
-            with open(filepath, 'rb') as f:
-                # Read first 1024 bytes to check for binary content
-                chunk = f.read(1024)
-                if not chunk:
-                    return True  # Empty files are considered text
-                
-                # Check for null bytes (common in binary files)
-                if b'\x00' in chunk:
-                    return False
-                
-                # Try to decode as UTF-8
-                try:
-                    chunk.decode('utf-8')
-                    return True
-                except UnicodeDecodeError:
-                    pass
-                
-                # Try to decode as latin-1 (fallback)
-                try:
-                    chunk.decode('latin-1')
-                    return True
-                except UnicodeDecodeError:
-                    return False
-                    
-        except (OSError, IOError):
+            fd = os.open(str(filepath), os.O_RDONLY)
+            try:
+                chunk = os.pread(fd, 1024, 0)
+            finally:
+                os.close(fd)
+        except OSError:
             return False
 
-    def _load_documents(self) -> List[Document]:
-        documents = []
-        extensions = ['.txt', '.md', '.py', '.js', '.json', '.yaml', '.yml', '.sh', '.sql']
-        
-        if not self.notes_dir.exists():
-            console.print(f"[yellow]Notes directory {self.notes_dir} does not exist[/yellow]")
-            return documents
-        
-        files = []
-        # Add files with known extensions
-        for ext in extensions:
-            potential_files = self.notes_dir.rglob(f"*{ext}")
-            for filepath in potential_files:
-                if not self._should_skip_path(filepath):
-                    files.append(filepath)
-        
-        # Add extension-less files that appear to be text files
-        all_files = self.notes_dir.rglob("*")
-        for filepath in all_files:
-            if (filepath.is_file() and 
-                not filepath.suffix and 
-                not self._should_skip_path(filepath) and 
-                self._is_text_file(filepath)):
-                files.append(filepath)
-        
-        # Remove duplicates while preserving order
-        files = list(dict.fromkeys(files))
-        
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task(f"Loading {len(files)} files...", total=len(files))
-            
-            for filepath in files:
+        if not chunk:
+            return True  # Empty files are considered text
+
+        return len(chunk.translate(None, _BINARY_BYTES)) == len(chunk)
+
+    def _iter_note_files(self, root: Path):
+        """Walk the notes tree once with os.scandir, yielding indexable files.
+
+        DirEntry objects carry cached type information, so this costs one
+        syscall per directory rather than re-statting every file the way
+        repeated rglob passes do. Skip directories are pruned in-line, and
+        extension-less files are content-sniffed during the same pass, so
+        each path is visited exactly once.
+        """
+        stack = [str(root)]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = os.scandir(current)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            ext = os.path.splitext(entry.name)[1]
+                            if ext in EXT_SET or (not ext and self._is_text_file(entry.path)):
+                                # DirEntry caches the stat result; pass it
+                                # along so loading never re-stats the file
+                                yield Path(entry.path), entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+
+    def _produce_documents(self, out_q: "queue.Queue", force_reindex: bool = False):
+        """Pipeline stage 1: walk, hash, and load changed files.
+
+        File I/O and hashing are fanned out over a thread pool; manifest
+        updates happen on this stage's thread as results drain back in, and
+        loaded documents are pushed downstream (the bounded queue provides
+        backpressure against the split/embed stages).
+        """
+        try:
+            # One walk finds both extension-matched and extension-less text
+            # files, so no dedup pass is needed
+            files = list(self._iter_note_files(self.notes_dir))
+
+            known_files = self.manifest.setdefault('files', {})
+            pending_aliases = []
+            workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                loader_fn = lambda item: self._load_one(item[0], item[1], known_files, force_reindex)
+                for (filepath, _), outcome in zip(files, executor.map(loader_fn, files)):
+                    kind, stat, file_hash, payload = outcome
+                    source = str(filepath)
+
+                    if kind == 'touch':
+                        # Touched but content unchanged: refresh mtime only
+                        known_files[source]['mtime'] = stat.st_mtime
+                    elif kind == 'alias':
+                        # Identical content already embedded this run under
+                        # another path; record the alias instead of re-embedding
+                        known_files[source] = {
+                            'mtime': stat.st_mtime,
+                            'hash': file_hash,
+                            'alias_of': payload,
+                        }
+                        pending_aliases.append((payload, source))
+                    elif kind == 'docs':
+                        known_files[source] = {'mtime': stat.st_mtime, 'hash': file_hash}
+                        self._docs_loaded += len(payload)
+                        for doc in payload:
+                            out_q.put(doc)
+
+            for canonical, alias in pending_aliases:
+                entry = known_files.get(canonical)
+                if entry is not None and alias not in entry.setdefault('aliases', []):
+                    entry['aliases'].append(alias)
+        except Exception as e:
+            console.print(f"[red]Indexing walk failed: {e}[/red]")
+        finally:
+            out_q.put(None)
+
+    def _split_stage(self, in_q: "queue.Queue", out_q: "queue.Queue"):
+        """Pipeline stage 2: split loaded documents into chunks"""
+        try:
+            while True:
+                doc = in_q.get()
+                if doc is None:
+                    break
                 try:
-                    loader = TextLoader(str(filepath), encoding='utf-8')
-                    file_docs = loader.load()
-                    
-                    for doc in file_docs:
-                        # Include filename in the content for better search relevance
-                        # Format: "Filename: <name>\n<original content>"
-                        filename_header = f"Filename: {filepath.name}\nPath: {filepath.parent.name}/{filepath.name}\n\n"
-                        doc.page_content = filename_header + doc.page_content
-                        
-                        doc.metadata.update({
-                            'source': str(filepath),
-                            'filename': filepath.name,
-                            'modified': datetime.fromtimestamp(filepath.stat().st_mtime).isoformat(),
-                            'file_hash': self._get_file_hash(filepath),
-                        })
-                    
-                    documents.extend(file_docs)
-                    progress.update(task, advance=1)
-                    
+                    for chunk in self.text_splitter.split_documents([doc]):
+                        out_q.put(chunk)
                 except Exception as e:
-                    console.print(f"[red]Error loading {filepath}: {e}[/red]")
-                    progress.update(task, advance=1)
-        
-        return documents
+                    source = doc.metadata.get('source', 'unknown')
+                    console.print(f"[red]Error splitting {source}: {e}[/red]")
+        finally:
+            out_q.put(None)
+
+    def _load_one(self, filepath: Path, stat: os.stat_result, known_files: dict, force_reindex: bool):
+        """Hash and load a single file; runs on a worker thread.
+
+        Returns a (kind, stat, file_hash, payload) tuple where kind is
+        'skip', 'touch' (mtime refresh only), 'alias' (duplicate content,
+        payload is the canonical source), or 'docs' (payload is the loaded
+        documents).
+        """
+        try:
+            source = str(filepath)
+            file_hash = None
+
+            # Skip files that haven't changed since the last index run
+            if not force_reindex:
+                entry = known_files.get(source)
+                if entry is not None:
+                    if entry.get('mtime') == stat.st_mtime:
+                        return ('skip', stat, None, None)
+                    file_hash = self._file_hash(filepath, stat.st_mtime)
+                    if entry.get('hash') == file_hash:
+                        return ('touch', stat, file_hash, None)
+
+            if file_hash is None:
+                file_hash = self._file_hash(filepath, stat.st_mtime)
+
+            # Dedupe identical files: only the first path with a given hash
+            # gets embedded (setdefault is atomic under the GIL)
+            canonical = self._seen_hashes.setdefault(file_hash, source)
+            if canonical != source:
+                return ('alias', stat, file_hash, canonical)
+
+            loader = TextLoader(str(filepath), encoding='utf-8')
+            file_docs = loader.load()
+
+            for doc in file_docs:
+                # Include filename in the content for better search relevance
+                # Format: "Filename: <name>\n<original content>"
+                filename_header = f"Filename: {filepath.name}\nPath: {filepath.parent.name}/{filepath.name}\n\n"
+                doc.page_content = filename_header + doc.page_content
+
+                doc.metadata.update({
+                    'source': source,
+                    'filename': filepath.name,
+                    'modified': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(stat.st_mtime)),
+                    'file_hash': file_hash,
+                })
+
+            return ('docs', stat, file_hash, file_docs)
+
+        except Exception as e:
+            console.print(f"[red]Error loading {filepath}: {e}[/red]")
+            return ('skip', None, None, None)
     
     def index(self, force_reindex: bool = False) -> int:
         console.print(f"[bold blue]Indexing notes from {self.notes_dir}[/bold blue]")
-        
-        documents = self._load_documents()
-        
-        if not documents:
-            console.print("[yellow]No documents found to index[/yellow]")
-            return 0
-        
-        console.print(f"[green]Loaded {len(documents)} documents[/green]")
-        
-        chunks = self.text_splitter.split_documents(documents)
-        console.print(f"[green]Split into {len(chunks)} chunks[/green]")
-        
-        persist_directory = str(self.index_dir)
-        
+
         if force_reindex and self.index_dir.exists():
             import shutil
             shutil.rmtree(self.index_dir)
             self.index_dir.mkdir(parents=True, exist_ok=True)
-        
-        with console.status("[bold green]Creating vector embeddings..."):
-            if self.index_dir.exists() and any(self.index_dir.iterdir()):
-                self.vectorstore = Chroma(
-                    persist_directory=persist_directory,
-                    embedding_function=self.embeddings,
-                )
-                self.vectorstore.add_documents(chunks)
+            self.manifest = {}
+
+        if not self.notes_dir.exists():
+            console.print(f"[yellow]Notes directory {self.notes_dir} does not exist[/yellow]")
+            return 0
+
+        self._docs_loaded = 0
+        self._seen_hashes = {}
+        existing_index = self._index_exists()
+
+        # Three-stage pipeline over bounded queues so file I/O, splitting,
+        # and embedding overlap instead of running strictly one after another:
+        # the embedder no longer sits idle during the walk, nor the disk
+        # during encoding
+        load_q = queue.Queue(maxsize=64)
+        chunk_q = queue.Queue(maxsize=256)
+        loader = threading.Thread(
+            target=self._produce_documents, args=(load_q, force_reindex), daemon=True
+        )
+        splitter = threading.Thread(
+            target=self._split_stage, args=(load_q, chunk_q), daemon=True
+        )
+
+        total_chunks = 0
+        deleted_sources = set()
+        batch = []
+        with console.status("[bold green]Indexing (load → split → embed)...") as status:
+            loader.start()
+            splitter.start()
+            while True:
+                chunk = chunk_q.get()
+                if chunk is None:
+                    break
+                batch.append(chunk)
+                if len(batch) >= 512:
+                    total_chunks += self._flush_chunks(batch, existing_index, deleted_sources)
+                    batch = []
+                    status.update(
+                        f"[bold green]Indexing... {total_chunks} chunks embedded"
+                    )
+            if batch:
+                total_chunks += self._flush_chunks(batch, existing_index, deleted_sources)
+        loader.join()
+        splitter.join()
+
+        if total_chunks == 0:
+            if self.manifest.get('files'):
+                # Unchanged files may still have had their mtimes refreshed
+                self._save_manifest()
+                console.print("[green]Index is up to date[/green]")
             else:
-                self.vectorstore = Chroma.from_documents(
-                    documents=chunks,
-                    embedding=self.embeddings,
-                    persist_directory=persist_directory,
-                )
-        
-        console.print(f"[bold green]✓ Indexed {len(chunks)} chunks successfully![/bold green]")
-        return len(chunks)
-    
-    def get_vectorstore(self) -> Optional[Chroma]:
+                console.print("[yellow]No documents found to index[/yellow]")
+            return 0
+
+        console.print(
+            f"[green]Loaded {self._docs_loaded} documents, {total_chunks} chunks[/green]"
+        )
+
+        self._export_embeddings()
+        self.manifest['stats'] = {
+            'file_count': len(self.manifest.get('files', {})),
+            'chunk_count': self.vectorstore._collection.count(),
+            'indexed_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self._save_manifest()
+        console.print(f"[bold green]✓ Indexed {total_chunks} chunks successfully![/bold green]")
+        return total_chunks
+
+    def _index_exists(self) -> bool:
+        """Probe Chroma's marker file - one stat instead of a directory listing"""
+        return (self.index_dir / "chroma.sqlite3").is_file()
+
+    def _flush_chunks(self, batch: List[Document], existing_index: bool, deleted_sources: set) -> int:
+        """Pipeline stage 3: embed a chunk batch and add it to Chroma"""
         if self.vectorstore is None:
-            persist_directory = str(self.index_dir)
-            if self.index_dir.exists() and any(self.index_dir.iterdir()):
-                self.vectorstore = Chroma(
-                    persist_directory=persist_directory,
-                    embedding_function=self.embeddings,
-                )
+            from langchain_chroma import Chroma
+            self.vectorstore = Chroma(
+                persist_directory=str(self.index_dir),
+                embedding_function=self.embeddings,
+            )
+
+        if existing_index:
+            # Drop stale chunks for changed files before their first re-add
+            for source in {chunk.metadata.get('source') for chunk in batch}:
+                if source and source not in deleted_sources:
+                    self.vectorstore._collection.delete(where={'source': source})
+                    deleted_sources.add(source)
+
+        self._add_chunks(batch)
+        return len(batch)
+
+    def _export_embeddings(self):
+        """Mirror the collection's embeddings for the in-memory fast path.
+
+        Stored as FP16: top-k scoring is memory-bound, so halving the bytes
+        per vector halves what moves through disk and caches; the precision
+        loss is negligible for ranking.
+        """
+        try:
+            data = self.vectorstore._collection.get(include=['embeddings'])
+            ids = data.get('ids') or []
+            embeddings = data.get('embeddings')
+            if not ids or embeddings is None:
+                return
+            matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float16))
+            np.save(self.index_dir / 'emb_fp16.npy', matrix)
+            (self.index_dir / 'emb_ids.json').write_text(json.dumps(ids))
+            legacy = self.index_dir / 'emb.npy'
+            if legacy.exists():
+                legacy.unlink()
+        except Exception as e:
+            console.print(f"[yellow]Could not export embedding matrix: {e}[/yellow]")
+
+    def _add_chunks(self, chunks: List[Document], batch_size: int = 512):
+        """Embed chunks in large batches and add them to Chroma directly.
+
+        Pre-computing embeddings via embed_documents (which encodes with the
+        batch size set in encode_kwargs) and handing them to the collection
+        avoids Chroma re-encoding and amortizes per-call overhead.
+        """
+        import uuid
+
+        collection = self.vectorstore._collection
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+            texts = [chunk.page_content for chunk in batch]
+            embeddings = self.embeddings.embed_documents(texts)
+            collection.add(
+                ids=[uuid.uuid4().hex for _ in batch],
+                embeddings=embeddings,
+                documents=texts,
+                metadatas=[chunk.metadata for chunk in batch],
+            )
+    
+    def get_vectorstore(self) -> Optional["Chroma"]:
+        if self.vectorstore is None and self._index_exists():
+            from langchain_chroma import Chroma
+            self.vectorstore = Chroma(
+                persist_directory=str(self.index_dir),
+                embedding_function=self.embeddings,
+            )
         return self.vectorstore
\ No newline at end of file
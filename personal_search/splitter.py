@@ -0,0 +1,90 @@
+"""Text splitter specialized for this project's fixed chunking config.
+
+RecursiveCharacterTextSplitter re-scans every document once per separator
+("\n\n", "\n", " ", ""). Since chunk size, overlap, and separators are
+configuration constants here, FastSplitter partially evaluates them away:
+one pre-compiled regex pass collects every candidate break offset, then
+chunks are emitted by cutting at the best boundary within each window
+(paragraph break, then newline, then space, then a hard cut).
+
+Output is close to, but not chunk-for-chunk identical with, the LangChain
+splitter, so it is opt-in via the use_fast_splitter setting.
+"""
+
+import re
+from bisect import bisect_right
+from typing import List
+
+from langchain.schema import Document
+
+_BOUNDARY_RE = re.compile(r"\n\n|\n| ")
+
+
+class FastSplitter:
+    def __init__(self, chunk_size: int, chunk_overlap: int):
+        self._size = chunk_size
+        self._overlap = min(chunk_overlap, chunk_size - 1) if chunk_size > 1 else 0
+
+    def split_text(self, text: str) -> List[str]:
+        if not text:
+            return []
+        if len(text) <= self._size:
+            stripped = text.strip()
+            return [stripped] if stripped else []
+
+        # Single scan: bucket break offsets by separator strength
+        paragraph_breaks = []
+        newline_breaks = []
+        space_breaks = []
+        for match in _BOUNDARY_RE.finditer(text):
+            group = match.group()
+            if group == '\n\n':
+                paragraph_breaks.append(match.start())
+            elif group == '\n':
+                newline_breaks.append(match.start())
+            else:
+                space_breaks.append(match.start())
+
+        chunks = []
+        start = 0
+        prev_cut = 0
+        length = len(text)
+        # A boundary must consume at least half the window: cutting just
+        # past start would emit a sliver and, once the overlap backs start
+        # up behind the same separator, degenerate 1-char-step suffixes
+        min_progress = self._size // 2
+        while start < length:
+            end = start + self._size
+            if end >= length:
+                tail = text[start:].strip()
+                if tail:
+                    chunks.append(tail)
+                break
+
+            # Cut at the strongest boundary inside (floor, end]; never
+            # re-cut at or before a previous cut
+            cut = None
+            floor = max(start + min_progress, prev_cut)
+            for breaks in (paragraph_breaks, newline_breaks, space_breaks):
+                i = bisect_right(breaks, end) - 1
+                if i >= 0 and breaks[i] > floor:
+                    cut = breaks[i]
+                    break
+            if cut is None:
+                cut = end
+
+            chunk = text[start:cut].strip()
+            if chunk:
+                chunks.append(chunk)
+            prev_cut = cut
+            start = max(cut - self._overlap, start + 1)
+
+        return chunks
+
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """Split documents, carrying metadata through (LangChain-compatible)"""
+        chunks = []
+        for doc in documents:
+            for text in self.split_text(doc.page_content):
+                chunks.append(Document(page_content=text, metadata=dict(doc.metadata)))
+        return chunks